@@ -20,6 +20,7 @@
 
 from PIL import Image
 import requests
+from requests.adapters import HTTPAdapter
 from io import BytesIO
 import matplotlib.pyplot as plt
 
@@ -27,7 +28,14 @@ get_ipython().run_line_magic('matplotlib', 'inline')
 
 logo_url = "https://www.sharepointeurope.com/nitropack_static/bIzdMVbKVbEcBjshCfCgJMJeENfwVVUk/assets/images/optimized/rev-a347ba2/www.sharepointeurope.com/wp-content/uploads/2025/05/EMFCC_Vienna25_Logo_Primary_White.png"
 
-response = requests.get(logo_url)
+# Shared HTTP session so every fetch in this notebook reuses pooled keep-alive connections
+session = requests.Session()
+session.headers.update({"User-Agent": "Mozilla/5.0"})
+adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=3)
+session.mount("https://", adapter)
+session.mount("http://", adapter)
+
+response = session.get(logo_url)
 logo = Image.open(BytesIO(response.content))
 
 # Convert to RGBA to avoid transparency warnings
@@ -60,15 +68,14 @@ plt.show()
 # 
 # Here’s what we do step by step:
 # 
-# 1. **Fetch the webpage** using `requests` and parse it with `BeautifulSoup`.
+# 1. **Fetch the webpage** using the shared `requests` session and parse it with `lxml`.
 # 2. **Extract session details** including Day, Time, Code, Tag/Group, Title, Link, Level, Topic, and Speakers.
 # 3. **Clean the data**:
 #    - Fill missing Day and Time values
 #    - Drop empty rows
 #    - Merge speaker-only rows with their main sessions
 #    - Add a sequential index
-# 4. **Convert the DataFrame to Spark** for large-scale processing.
-# 5. **Save the data** as a Delta table in the Fabric Lakehouse, ready for analysis or dashboards.
+# 4. **Save the data** as a Delta table in the Fabric Lakehouse straight from pandas with `deltalake`, ready for analysis or dashboards.
 # 
 # At the end, we’ll have a **clean, structured dataset** of all FabCon 2025 sessions and speakers, ready for exploration and insights.
 # 
@@ -76,140 +83,143 @@ plt.show()
 # In[51]:
 
 
-import requests
-from bs4 import BeautifulSoup
+from email.message import Message
+import lxml.html
+from lxml import etree
+from bs4.dammit import EncodingDetector
+import numpy as np
 import pandas as pd
-from pyspark.sql import SparkSession
-
-# Start Spark session
-spark = SparkSession.builder.appName("FabCon2025").getOrCreate()
+from deltalake import WriterProperties, write_deltalake
 
 # Fetch the webpage
 url = "https://www.sharepointeurope.com/conference/schedule/2025-Fabric/"
-headers = {"User-Agent": "Mozilla/5.0"}
-response = requests.get(url, headers=headers)
-soup = BeautifulSoup(response.content, "html.parser")
-
-all_sessions = []
+response = session.get(url)
+# Parse the raw bytes once, with an explicit encoding: the Content-Type charset when the server sends
+# one, otherwise the page's own <meta>/XML declaration, otherwise utf-8. No statistical detection
+# (charset-normalizer) runs, and lxml never has to guess Latin-1 for a page without a <meta> tag
+content_type = Message()
+content_type["Content-Type"] = response.headers.get("Content-Type", "")
+header_charset = content_type.get_content_charset()
+encoding = header_charset or EncodingDetector.find_declared_encoding(response.content, is_html=True) or "utf-8"
+tree = lxml.html.fromstring(response.content, parser=lxml.html.HTMLParser(encoding=encoding))
+
+# Compiled once, reused for every row
+DAY_BLOCKS = etree.XPath("//div[contains(concat(' ', normalize-space(@class), ' '), ' tb-day ')]")
+DAY_ROWS = etree.XPath(".//table//tr[.//td]")
+TITLE_COL = etree.XPath(
+    ".//p[contains(concat(' ', normalize-space(@class), ' '), ' event-title ')"
+    " or contains(concat(' ', normalize-space(@class), ' '), ' keynote-title ')]"
+)
+
+# One list per column
+days, times, codes, tags, titles, links, levels, topics, speakers_list = ([] for _ in range(9))
 
 # Loop through each day
-day_blocks = soup.find_all("div", class_="tb-day")
+day_blocks = DAY_BLOCKS(tree)
 for day_block in day_blocks:
     day_name = day_block.get("data-name", "Unknown Day")
     
-    tables = day_block.find_all("table")
-    for table in tables:
-        rows = table.find_all("tr")
-        for row in rows:
-            cols = row.find_all("td")
-            if not cols:
-                continue
-
-            # Initialize session fields
-            time = code = tag = title = link = level = topic = speakers = ""
-            
-            # Get the first non-empty time
-            for t_col in row.find_all("td", class_="time"):
-                t_text = t_col.get_text(strip=True)
-                if t_text:
-                    time = t_text
-                    break
-            
-            # Session code
-            code_col = row.find("td", class_="code")
-            if code_col:
-                code = code_col.get_text(strip=True)
-            
-            # Tag/Group
-            tag_col = row.find("td", class_="tag")
-            if tag_col:
-                tag = tag_col.get_text(strip=True)
-            
-            # Title and link (event-title or keynote-title)
-            title_col = row.find("p", class_="event-title") or row.find("p", class_="keynote-title")
-            if title_col:
-                title = title_col.get_text(strip=True)
-                link_tag = title_col.find("a", href=True)
-                if link_tag:
-                    link = link_tag["href"]
-            else:
-                # For rest-description rows
-                rest_desc_col = row.find("td", class_="rest-description")
-                if rest_desc_col:
-                    title = rest_desc_col.get_text(strip=True)
-            
-            # Level and topic
-            level_col = row.find("td", class_="level-cell")
-            if level_col:
-                level = level_col.get_text(strip=True)
-            
-            topic_col = row.find("td", class_="topic-cell")
-            if topic_col:
-                topic = topic_col.get_text(strip=True)
-            
-            # Speakers (meta rows)
-            if "meta" in row.get("class", []):
-                speaker_td = row.find("td", class_="light-bg")
-                if speaker_td:
-                    speakers = ", ".join([a.get_text(strip=True) for a in speaker_td.find_all("a")])
-            
-            # Skip empty rows
-            if not any([time, code, tag, title, level, topic, speakers]):
-                continue
-            
-            all_sessions.append({
-                "Day": day_name,
-                "Time": time,
-                "Code": code,
-                "Tag/Group": tag,
-                "Title": title,
-                "Link": link,
-                "Level": level,
-                "Topic": topic,
-                "Speakers": speakers
-            })
+    for row in DAY_ROWS(day_block):
+        cols = list(row.iter("td"))
+
+        # Initialize session fields
+        time = code = tag = title = link = level = topic = speakers = ""
+        
+        # Index the cells by class in one pass instead of re-walking the row per field
+        cells = {}
+        for col in cols:
+            for cls in col.get("class", "").split():
+                cells.setdefault(cls, []).append(col)
+        
+        # Get the first non-empty time
+        for t_col in cells.get("time", []):
+            t_text = t_col.text_content().strip()
+            if t_text:
+                time = t_text
+                break
+        
+        # Session code
+        if "code" in cells:
+            code = cells["code"][0].text_content().strip()
+        
+        # Tag/Group
+        if "tag" in cells:
+            tag = cells["tag"][0].text_content().strip()
+        
+        # Title and link (event-title or keynote-title)
+        title_cols = TITLE_COL(row)
+        if title_cols:
+            title_col = title_cols[0]
+            title = title_col.text_content().strip()
+            link_tag = title_col.find(".//a[@href]")
+            if link_tag is not None:
+                link = link_tag.get("href")
+        elif "rest-description" in cells:
+            # For rest-description rows
+            title = cells["rest-description"][0].text_content().strip()
+        
+        # Level and topic
+        if "level-cell" in cells:
+            level = cells["level-cell"][0].text_content().strip()
+        
+        if "topic-cell" in cells:
+            topic = cells["topic-cell"][0].text_content().strip()
+        
+        # Speakers (meta rows); the cheap dict lookup runs first so most rows skip the class scan
+        if "light-bg" in cells and "meta" in row.get("class", "").split():
+            speaker_td = cells["light-bg"][0]
+            speakers = ", ".join([a.text_content().strip() for a in speaker_td.iter("a")])
+        
+        # Skip empty rows
+        if not any([time, code, tag, title, level, topic, speakers]):
+            continue
+        
+        days.append(day_name)
+        times.append(time)
+        codes.append(code)
+        tags.append(tag)
+        titles.append(title)
+        links.append(link)
+        levels.append(level)
+        topics.append(topic)
+        speakers_list.append(speakers)
 
 # Create initial DataFrame
-df = pd.DataFrame(all_sessions)
+df = pd.DataFrame({
+    "Day": days,
+    "Time": times,
+    "Code": codes,
+    "Tag/Group": tags,
+    "Title": titles,
+    "Link": links,
+    "Level": levels,
+    "Topic": topics,
+    "Speakers": speakers_list
+})
 
 # Fill down  Day/Time
-df['Day'] = df['Day'].replace('', pd.NA).fillna(method='ffill')
-df['Time'] = df['Time'].replace('', pd.NA).fillna(method='ffill')
+for col in ['Day', 'Time']:
+    df[col] = df[col].mask(df[col].eq('')).ffill()
 
 # Drop completely empty sessions
 df = df.dropna(subset=['Code', 'Title'], how='all')
 df['Speakers'] = df['Speakers'].fillna('')
 
-# Merge speaker-only rows with main sessions
-merged_rows = []
-previous_row = None
-for _, row in df.iterrows():
-    if row['Title']:
-        if previous_row is not None:
-            merged_rows.append(previous_row)
-        previous_row = row.copy()
-    else:
-        if previous_row is not None and row['Speakers']:
-            if previous_row['Speakers']:
-                previous_row['Speakers'] += ", " + row['Speakers']
-            else:
-                previous_row['Speakers'] = row['Speakers']
-
-# Add last session
-if previous_row is not None:
-    merged_rows.append(previous_row)
-
-# Final cleaned DataFrame
-final_df = pd.DataFrame(merged_rows)
+# Merge speaker-only rows with main sessions:
+# every titled row opens a new session group, rows before the first title are dropped
+is_title = df['Title'].ne('')
+grp = is_title.cumsum()
+group_speakers = df.loc[grp.gt(0) & df['Speakers'].ne(''), 'Speakers'].groupby(grp).agg(", ".join)
 
-# Add sequential index
-final_df.insert(0, "Index", range(1, len(final_df) + 1))
+# Final cleaned DataFrame: the titled rows as they are, with their group's speakers written back
+final_df = df[is_title].reset_index(drop=True)
+final_df['Speakers'] = group_speakers.reindex(range(1, len(final_df) + 1), fill_value='').to_numpy()
 
-# Convert to Spark DataFrame
-dff = spark.createDataFrame(final_df)
+# Add sequential index
+final_df.insert(0, "Index", np.arange(1, len(final_df) + 1, dtype='int32'))
 
-# Display Spark DataFrame
-display(dff.limit(5))
+# Display DataFrame
+display(final_df.head(5))
 
 # Path
 path = "abfss://MicrosoftPowerBI@onelake.dfs.fabric.microsoft.com/Lakehouse.Lakehouse/Tables/"
@@ -217,11 +227,24 @@ path = "abfss://MicrosoftPowerBI@onelake.dfs.fabric.microsoft.com/Lakehouse.Lake
 # Table name
 delta_table_name = "EuropeFullProgramme"
 
-# Save Spark DataFrame as Delta table in Fabric Lakehouse
-dff.write.mode("overwrite").format("delta").save(f'{path}{delta_table_name}')
+# Save DataFrame as Delta table in Fabric Lakehouse (delta-rs, no Spark/JVM round-trip)
+storage_options = {"bearer_token": notebookutils.credentials.getToken("storage"), "use_fabric_endpoint": "true"}
+# Partitioned by Day so per-day queries prune files, ZSTD-compressed Parquet
+write_deltalake(
+    f'{path}{delta_table_name}',
+    final_df,
+    mode="overwrite",
+    schema_mode="overwrite",
+    partition_by=["Day"],
+    writer_properties=WriterProperties(compression="ZSTD", compression_level=3),
+    storage_options=storage_options,
+)
 
 print(f"DataFrame successfully saved to table '{path}{delta_table_name}'")
 
+# DataFrame for the analysis below, with the low-cardinality columns as categoricals
+pdf = final_df.astype({col: 'category' for col in ['Day', 'Level', 'Topic', 'Tag/Group']})
+
 
 # ## **Explore Insights from FabCon 2025**
 # 
@@ -246,8 +269,9 @@ print(f"DataFrame successfully saved to table '{path}{delta_table_name}'")
 # In[52]:
 
 
+day_counts = pdf['Day'].value_counts().reindex(pdf['Day'].unique())
 plt.figure(figsize=(10,6))
-sns.countplot(data=pdf, x='Day', order=pdf['Day'].unique(), palette="viridis")
+plt.bar(day_counts.index, day_counts.values, color=plt.get_cmap("viridis", len(day_counts))(range(len(day_counts))))
 plt.title("Number of Sessions per Day")
 plt.xlabel("Day")
 plt.ylabel("Number of Sessions")
@@ -264,9 +288,10 @@ plt.show()
 # In[53]:
 
 
-top_topics = pdf['Topic'].value_counts().head(10).index
+topic_counts = pdf['Topic'].value_counts().head(10)
 plt.figure(figsize=(12,6))
-sns.countplot(data=pdf[pdf['Topic'].isin(top_topics)], y='Topic', order=top_topics, palette="coolwarm")
+plt.barh(topic_counts.index, topic_counts.values, color=plt.get_cmap("coolwarm", len(topic_counts))(range(len(topic_counts))))
+plt.gca().invert_yaxis()
 plt.title("Top 10 Topics by Number of Sessions")
 plt.xlabel("Number of Sessions")
 plt.ylabel("Topic")
@@ -282,11 +307,17 @@ plt.show()
 # In[54]:
 
 
-all_speakers = pdf['Speakers'].str.split(', ').explode()
-top_speakers = all_speakers.value_counts().head(10).index
+from collections import Counter
+
+# Count speakers straight from the strings, without materializing an exploded Series
+speaker_counter = Counter()
+for speakers in pdf['Speakers'].dropna():
+    speaker_counter.update(filter(None, speakers.split(', ')))
+top_speakers = speaker_counter.most_common(10)
 
 plt.figure(figsize=(12,6))
-sns.countplot(y=all_speakers[all_speakers.isin(top_speakers)], order=top_speakers, palette="magma")
+plt.barh([name for name, _ in top_speakers], [count for _, count in top_speakers], color=plt.get_cmap("magma", len(top_speakers))(range(len(top_speakers))))
+plt.gca().invert_yaxis()
 plt.title("Top 10 Speakers by Number of Sessions")
 plt.xlabel("Number of Sessions")
 plt.ylabel("Speaker")
@@ -302,8 +333,9 @@ plt.show()
 # In[55]:
 
 
+level_counts = pdf['Level'].value_counts()
 plt.figure(figsize=(10,5))
-sns.countplot(data=pdf, x='Level', palette="pastel", order=pdf['Level'].value_counts().index)
+plt.bar(level_counts.index, level_counts.values, color=plt.get_cmap("Pastel1", len(level_counts))(range(len(level_counts))))
 plt.title("Distribution of Sessions by Level")
 plt.xlabel("Level")
 plt.ylabel("Number of Sessions")
@@ -322,9 +354,9 @@ plt.show()
 
 
 # Convert Time to start hour
-pdf['Start_Hour'] = pdf['Time'].str.extract(r'(\d{2}):')[0].astype(int)
+pdf['Start_Hour'] = pdf['Time'].str.slice(0, 2).astype('int8')
 plt.figure(figsize=(10,5))
-sns.histplot(pdf['Start_Hour'], bins=range(8,19), kde=False, color='skyblue')
+plt.hist(pdf['Start_Hour'], bins=range(8,19), color='skyblue', edgecolor='white')
 plt.title("Sessions Over Time")
 plt.xlabel("Start Hour")
 plt.ylabel("Number of Sessions")